@@ -146,9 +146,12 @@ def clean_and_extract_series(series: pd.Series) -> pd.DataFrame:
 
     initial_count = len(series)
 
-    results = [clean_and_extract_complete(str(name)) for name in series]
+    # Product names repeat across rows: extract each distinct name once and
+    # map the rows back by position
+    codes, uniques = pd.factorize(series.map(str))
+    results = [clean_and_extract_complete(name) for name in uniques]
 
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(results).take(codes)
     df.index = series.index
 
     logger.info(
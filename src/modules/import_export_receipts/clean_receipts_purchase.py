@@ -15,11 +15,15 @@ This script:
 """
 
 import csv
+import json
 import logging
+import os
 import re
 import tomllib
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -56,6 +60,13 @@ _CONFIG = load_pipeline_config()
 DATA_RAW_DIR = Path(_CONFIG["dirs"]["raw_data"]) / "import_export"
 DATA_STAGING_DIR = Path(_CONFIG["dirs"]["staging"]) / "import_export"
 
+# Files are parsed concurrently; the C tokenizer releases the GIL
+MAX_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# Bump whenever combine_headers output changes so stale header caches are dropped
+HEADER_CACHE_VERSION = 1
+HEADER_CACHE_FILENAME = ".header_cache.json"
+
 # Column mappings: specific indices for NHAP structure
 HEADER_COLUMN_MAP = [
     ((0, 0, 1, 2), "Chứng từ nhập"),
@@ -123,6 +134,25 @@ COLUMN_ORDER = [
     "Tên nhà cung cấp",
 ]
 
+TEXT_COLUMNS = ["Mã hàng", "Mã chứng từ", "Tên nhà cung cấp", "Tên hàng"]
+NUMERIC_COLUMNS = ["Số lượng", "Đơn giá", "Thành tiền"]
+INTEGER_COLUMNS = ["Tháng", "Năm"]
+
+# Runs of whitespace, collapsed to a single space in headers and text columns
+_WS_RE = re.compile(r"\s+")
+
+# Date string shapes, one named group per parse stage. pandas' %Y matches
+# exactly 4 digits, %y exactly 2, and %d also accepts a single space-padded
+# digit, so a string can only be parsed by the formats of the stage its shape
+# maps to. The shapes are disjoint, so one alternation classifies in one pass.
+_DAY = r"(?:\d{1,2}| \d)"
+_DATE_SHAPE_RE = re.compile(
+    rf"^(?:(?P<ymd>\d{{4}}[/-]\d{{1,2}}[/-]{_DAY})"
+    rf"|(?P<ambiguous>{_DAY}/{_DAY}/\d{{4}})"
+    rf"|(?P<short_year>{_DAY}/{_DAY}/{_DAY})"
+    rf"|(?P<dash>{_DAY}-{_DAY}-(?:\d{{2}}|\d{{4}})))$"
+)
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -153,29 +183,35 @@ def combine_headers(
 
     def normalize_header(h: str) -> str:
         """Strip and replace internal whitespace."""
-        return re.sub(r"\s+", " ", h.strip())
+        return _WS_RE.sub(" ", h.strip())
+
+    # Every cell is normalized once; group headers spanning several
+    # sub-columns are then reused from these lists
+    main = [normalize_header(h) for h in header_row1[:27]]
+    sub = [normalize_header(h) for h in header_row2[:29]]
+    receipt, quantity, warranty = main[0], main[8], main[26]
 
     final_combined_headers = [
-        f"{normalize_header(header_row1[0])}_{normalize_header(header_row2[0])}",
-        f"{normalize_header(header_row1[0])}_{normalize_header(header_row2[1])}",
-        f"{normalize_header(header_row1[0])}_{normalize_header(header_row2[2])}",
-        normalize_header(header_row2[3]),
-        normalize_header(header_row1[4]),
-        normalize_header(header_row1[5]),
-        normalize_header(header_row1[6]),
-        normalize_header(header_row1[7]),
-        f"{normalize_header(header_row1[8])}_{normalize_header(header_row2[8])}",
-        f"{normalize_header(header_row1[8])}_{normalize_header(header_row2[9])}",
-        f"{normalize_header(header_row1[8])}_{normalize_header(header_row2[10])}",
-        f"{normalize_header(header_row1[8])}_{normalize_header(header_row2[14])}",
-        f"{normalize_header(header_row1[8])}_{normalize_header(header_row2[15])}",
-        normalize_header(header_row1[22]),
-        normalize_header(header_row1[23]),
-        normalize_header(header_row1[24]),
-        normalize_header(header_row1[25]),
-        f"{normalize_header(header_row1[26])}_{normalize_header(header_row2[26])}",
-        f"{normalize_header(header_row1[26])}_{normalize_header(header_row2[27])}",
-        f"{normalize_header(header_row1[26])}_{normalize_header(header_row2[28])}",
+        f"{receipt}_{sub[0]}",
+        f"{receipt}_{sub[1]}",
+        f"{receipt}_{sub[2]}",
+        sub[3],
+        main[4],
+        main[5],
+        main[6],
+        main[7],
+        f"{quantity}_{sub[8]}",
+        f"{quantity}_{sub[9]}",
+        f"{quantity}_{sub[10]}",
+        f"{quantity}_{sub[14]}",
+        f"{quantity}_{sub[15]}",
+        main[22],
+        main[23],
+        main[24],
+        main[25],
+        f"{warranty}_{sub[26]}",
+        f"{warranty}_{sub[27]}",
+        f"{warranty}_{sub[28]}",
     ]
 
     original_indices = [
@@ -300,43 +336,342 @@ def parse_date_robustly(row) -> pd.Timestamp:
     return pd.NaT
 
 
+def _parse_with_format(dates: pd.Series, fmt: str) -> pd.Series:
+    """Parse a Series of date strings with a single format (NaT on failure)."""
+    return pd.to_datetime(dates, format=fmt, errors="coerce", cache=True)
+
+
+def _fill_with_format(
+    parsed: pd.Series, dates: pd.Series, fmt: str, candidates: pd.Series
+) -> None:
+    """Fill still-unparsed ``candidates`` of ``parsed`` in place using one format."""
+    pending = parsed.isna() & candidates
+    if pending.any():
+        parsed.loc[pending] = _parse_with_format(dates[pending], fmt)
+
+
+def _classify_date_shapes(dates: pd.Series) -> pd.Series:
+    """Label each date string with the ``_DATE_SHAPE_RE`` group it matches.
+
+    Returns:
+        pd.Series: Shape label per entry, or NaN when no shape matches.
+    """
+    matched = dates.str.extract(_DATE_SHAPE_RE).notna()
+    return matched.idxmax(axis=1).where(matched.any(axis=1))
+
+
+@lru_cache(maxsize=4096)
+def _parse_general(date_str: str) -> Optional[pd.Timestamp]:
+    """Stage 5 fallback parse; returns None when the parser rejects the string.
+
+    Cached on the string alone: the result does not depend on the source
+    month/year, so a leftover string repeated across files is parsed once.
+    """
+    try:
+        return pd.to_datetime(date_str, dayfirst=True, errors="raise")
+    except ValueError:
+        return None
+
+
+DATE_KEY_COLUMNS = ["Ngày", "_source_file_month", "_source_file_year"]
+
+
+def parse_date_series(df: pd.DataFrame) -> pd.Series:
+    """Vectorized equivalent of ``parse_date_robustly`` over a whole DataFrame.
+
+    Receipt files repeat the same date string on every line of a document, so
+    only unique (date, source month, source year) triples are parsed; results
+    are merged back onto the original rows.
+
+    Args:
+        df: DataFrame with 'Ngày', '_source_file_month', '_source_file_year'.
+
+    Returns:
+        pd.Series: Parsed timestamps aligned to ``df.index`` (NaT if unparsed).
+    """
+    keys = df[DATE_KEY_COLUMNS]
+    unique_keys = keys.drop_duplicates()
+    if len(unique_keys) == len(keys):
+        return _parse_date_cascade(keys)
+
+    unique_keys = unique_keys.assign(_parsed=_parse_date_cascade(unique_keys))
+    merged = keys.merge(unique_keys, on=DATE_KEY_COLUMNS, how="left")
+    return pd.Series(
+        merged["_parsed"].to_numpy(), index=df.index, dtype="datetime64[ns]"
+    )
+
+
+def _parse_date_cascade(df: pd.DataFrame) -> pd.Series:
+    """Run the 6-stage ``parse_date_robustly`` cascade on whole Series.
+
+    Strings are first classified by shape (see ``_DATE_SHAPE_RE``) so each
+    bucket is only parsed with the formats that can match it. Each format is
+    parsed for the whole bucket at once with ``pd.to_datetime(..., format=fmt)``.
+    """
+    raw = df["Ngày"]
+    is_str = raw.map(lambda v: isinstance(v, str)).astype(bool)
+    dates = raw.where(is_str).astype(object).str.strip()
+    source_month = pd.to_numeric(df["_source_file_month"], errors="coerce")
+    source_year = pd.to_numeric(df["_source_file_year"], errors="coerce")
+
+    shapes = _classify_date_shapes(dates)
+    parsed = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+
+    # Stage 1: Unambiguous 4-digit year formats
+    for fmt in ["%Y/%m/%d", "%Y-%m-%d"]:
+        _fill_with_format(parsed, dates, fmt, shapes.eq("ymd"))
+
+    # Stage 2: Ambiguous 4-digit year formats (guided by source month)
+    pending = parsed.isna() & shapes.eq("ambiguous")
+    if pending.any():
+        month = source_month[pending]
+        parsed_dmy = _parse_with_format(dates[pending], "%d/%m/%Y")
+        parsed_mdy = _parse_with_format(dates[pending], "%m/%d/%Y")
+        use_mdy = parsed_mdy.notna() & (
+            parsed_dmy.isna() | parsed_mdy.dt.month.eq(month)
+        )
+        parsed.loc[pending] = parsed_mdy.where(use_mdy, parsed_dmy)
+
+    # Stage 3: 2-digit year formats (prefer match with source month)
+    pending = parsed.isna() & shapes.eq("short_year")
+    if pending.any():
+        month = source_month[pending]
+        candidates = [
+            _parse_with_format(dates[pending], fmt)
+            for fmt in ["%d/%m/%y", "%m/%d/%y", "%y/%m/%d"]
+        ]
+        matched = pd.Series(pd.NaT, index=month.index, dtype="datetime64[ns]")
+        first_valid = matched.copy()
+        for candidate in candidates:
+            matched = matched.combine_first(
+                candidate.where(candidate.dt.month.eq(month))
+            )
+            first_valid = first_valid.combine_first(candidate)
+        parsed.loc[pending] = matched.combine_first(first_valid)
+
+    # Stage 4: Dash formats
+    for fmt in ["%d-%m-%Y", "%m-%d-%Y", "%d-%m-%y", "%m-%d-%y"]:
+        _fill_with_format(parsed, dates, fmt, shapes.eq("dash"))
+
+    # Stage 5: Fallback to general parsing (only the few leftover strings)
+    pending = parsed.isna() & dates.notna()
+    rejected = pd.Series(False, index=df.index)
+    for idx, date_str in dates[pending].items():
+        result = _parse_general(date_str)
+        if result is None:
+            rejected.loc[idx] = True
+        else:
+            parsed.loc[idx] = result
+
+    # Stage 6: Use source year/month as last resort
+    fallback = (
+        rejected
+        & source_year.notna()
+        & source_month.notna()
+        & source_month.between(1, 12)
+    )
+    if fallback.any():
+        parsed.loc[fallback] = pd.to_datetime(
+            {
+                "year": source_year[fallback],
+                "month": source_month[fallback],
+                "day": 1,
+            },
+            errors="coerce",
+        )
+
+    return parsed
+
+
+@lru_cache(maxsize=64)
+def _combine_header_rows(
+    header_row1: Tuple[str, ...], header_row2: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """``combine_headers`` memoized on the raw header rows.
+
+    Monthly files of one layout carry identical header rows, so each distinct
+    layout is combined once and its files share the resulting (immutable)
+    header tuple.
+    """
+    headers, indices = combine_headers(list(header_row1), list(header_row2))
+    return tuple(headers), tuple(indices)
+
+
+def read_file_headers(
+    file_path: Path,
+) -> Optional[Tuple[Tuple[str, ...], Tuple[int, ...]]]:
+    """Read header rows 3-4 of one CSV file and combine them.
+
+    Returns:
+        tuple: (combined_headers, original_indices), or None if unreadable
+    """
+    try:
+        # Only read up to the header rows, not the whole file
+        with open(file_path, "r", encoding="utf-8") as f:
+            rows = list(islice(csv.reader(f), 5))
+
+        header_row_main = 3  # 0-indexed
+        header_row_sub = 4
+
+        if len(rows) > header_row_sub:
+            return _combine_header_rows(
+                tuple(rows[header_row_main]), tuple(rows[header_row_sub])
+            )
+        logger.warning(f"{file_path.name} has <5 rows, skipping.")
+    except Exception as e:
+        logger.error(f"Error processing {file_path.name} for headers: {e}")
+    return None
+
+
+def _read_header_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read a JSON header cache, returning {} if missing, stale or unreadable."""
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable header cache {cache_path}: {e}")
+        return {}
+    if not isinstance(data, dict) or data.get("version") != HEADER_CACHE_VERSION:
+        logger.info(f"Ignoring header cache {cache_path} from another version")
+        return {}
+    return data.get("files", {})
+
+
 def load_and_extract_headers(
-    matching_files: List[Path],
-) -> Dict[Path, Tuple[List[str], List[int]]]:
+    matching_files: List[Path], cache_path: Optional[Path] = None
+) -> Dict[Path, Tuple[Tuple[str, ...], Tuple[int, ...]]]:
     """Load CSV files and extract headers.
 
+    Files missing from the cache are read concurrently.
+
+    Args:
+        matching_files: CSV files to read headers from
+        cache_path: Optional JSON cache of previously extracted headers. Entries
+            are matched on (path, mtime_ns, size) so modified files are re-read,
+            and the whole cache is ignored unless it was written with the
+            current HEADER_CACHE_VERSION.
+
     Returns:
         dict: Mapping of file_path to (combined_headers, original_indices)
     """
+    cache = _read_header_cache(cache_path) if cache_path is not None else {}
+
     file_headers_map = {}
+    new_cache = {}
+    misses = []
     for file_path in matching_files:
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                rows = list(reader)
-
-            header_row_main = 3  # 0-indexed
-            header_row_sub = 4
-
-            if len(rows) > header_row_sub:
-                combined_header, original_indices = combine_headers(
-                    rows[header_row_main], rows[header_row_sub]
+            stat = file_path.stat()
+        except OSError as e:
+            logger.error(f"Error processing {file_path.name} for headers: {e}")
+            continue
+        key = str(file_path)
+        entry = cache.get(key)
+        if (
+            isinstance(entry, dict)
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+            and entry.get("size") == stat.st_size
+        ):
+            new_cache[key] = entry
+            file_headers_map[file_path] = (
+                tuple(entry["headers"]),
+                tuple(entry["indices"]),
+            )
+        else:
+            misses.append((file_path, key, stat))
+            file_headers_map[file_path] = None  # keeps input order
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+            results = executor.map(read_file_headers, [fp for fp, _, _ in misses])
+            for (file_path, key, stat), headers in zip(misses, results):
+                if headers is None:
+                    del file_headers_map[file_path]
+                    continue
+                file_headers_map[file_path] = headers
+                new_cache[key] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "headers": list(headers[0]),
+                    "indices": list(headers[1]),
+                }
+
+    if cache_path is not None and new_cache != cache:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": HEADER_CACHE_VERSION, "files": new_cache},
+                    f,
+                    ensure_ascii=False,
                 )
-                file_headers_map[file_path] = (combined_header, original_indices)
-            else:
-                logger.warning(f"{file_path.name} has <5 rows, skipping.")
         except Exception as e:
-            logger.error(f"Error processing {file_path.name} for headers: {e}")
+            logger.warning(f"Could not write header cache {cache_path}: {e}")
 
     return file_headers_map
 
 
+def load_group_file(
+    file_path: Path, original_indices: Tuple[int, ...], common_headers: List[str]
+) -> Optional[pd.DataFrame]:
+    """Load the data rows of one CSV file, projected onto the group headers.
+
+    Args:
+        file_path: CSV file named YYYY_MM_...
+        original_indices: Column indices to keep, in header order
+        common_headers: Column names for the kept columns
+
+    Returns:
+        pd.DataFrame with source year/month columns, or None on failure.
+    """
+    data_start_row = 5
+    try:
+        # Extract year/month from filename (format: YYYY_MM_...)
+        filename = file_path.name
+        parts = filename.split("_")
+        source_year = int(parts[0])
+        source_month = int(parts[1])
+
+        # Sheets exports trim trailing empty cells, so rows are ragged.
+        # The sub-header row is consumed as the parser header: it always
+        # reaches the last mapped column, so the C parser pads shorter data
+        # rows with nulls instead of misaligning usecols. index_col=False
+        # stops a wider first data row from being read as an implicit index.
+        # Only empty cells are read as null, so no string scan for "" is
+        # needed afterwards.
+        df = pd.read_csv(
+            file_path,
+            header=0,
+            index_col=False,
+            skiprows=data_start_row - 1,
+            usecols=original_indices,
+            dtype=str,
+            keep_default_na=False,
+            na_values=[""],
+            skip_blank_lines=False,
+            encoding="utf-8",
+            engine="c",
+        )
+        df.columns = common_headers
+        df["_source_file_month"] = source_month
+        df["_source_file_year"] = source_year
+        return df
+
+    except Exception as e:
+        logger.error(f"Error loading {file_path.name}: {e}")
+        return None
+
+
 def process_group_data(
-    files_and_indices_list: List[Tuple[Path, List[int]]],
+    files_and_indices_list: List[Tuple[Path, Tuple[int, ...]]],
     common_headers: List[str],
 ) -> pd.DataFrame:
     """Process data for a single group of files with same headers.
 
+    Files are loaded concurrently; results keep the input file order.
+
     Args:
         files_and_indices_list: List of (file_path, original_indices) tuples
         common_headers: List of column names
@@ -344,51 +679,12 @@ def process_group_data(
     Returns:
         pd.DataFrame: Merged DataFrame for the group
     """
-    group_dfs = []
-    data_start_row = 5
-
-    for file_path, original_indices in files_and_indices_list:
-        try:
-            # Extract year/month from filename (format: YYYY_MM_...)
-            filename = file_path.name
-            parts = filename.split("_")
-            source_year = int(parts[0])
-            source_month = int(parts[1])
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f)
-                all_rows = list(reader)
-
-            if len(all_rows) < data_start_row:
-                logger.warning(f"{file_path.name} has <5 rows, skipping data.")
-                continue
-
-            data_rows = all_rows[data_start_row:]
-            processed_data = []
-
-            for row_idx, row in enumerate(data_rows):
-                try:
-                    if len(row) > max(original_indices) if original_indices else 0:
-                        processed_data.append([row[idx] for idx in original_indices])
-                    else:
-                        # Fill missing columns with pd.NA
-                        new_row = [
-                            row[idx] if idx < len(row) else pd.NA
-                            for idx in original_indices
-                        ]
-                        processed_data.append(new_row)
-                except Exception as e:
-                    logger.warning(f"Row {row_idx} in {filename} rejected: {e}")
-                    continue
-
-            df = pd.DataFrame(processed_data, columns=common_headers)
-            df = df.replace("", pd.NA)
-            df["_source_file_month"] = source_month
-            df["_source_file_year"] = source_year
-            group_dfs.append(df)
-
-        except Exception as e:
-            logger.error(f"Error loading {file_path.name}: {e}")
+    with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+        loaded = executor.map(
+            lambda item: load_group_file(item[0], item[1], common_headers),
+            files_and_indices_list,
+        )
+        group_dfs = [df for df in loaded if df is not None]
 
     return pd.concat(group_dfs, ignore_index=True) if group_dfs else pd.DataFrame()
 
@@ -400,37 +696,45 @@ def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
     - Excel serial dates (floats)
     - Multiple date formats (string)
     - Year/month mismatches vs source file
+
+    Returns:
+        pd.DataFrame: Input with 'Ngày' as a datetime64 column (NaT if unknown).
     """
-    # Separate float and string dates
-    float_mask = df["Ngày"].apply(is_float_check)
-    float_dates_df = df[float_mask].copy()
-    string_dates_df = df[~float_mask].copy()
+    # Separate float and string dates (one vectorized coercion instead of a
+    # per-row is_float_check; "nan" strings parse to NaT on either path)
+    numeric_dates = pd.to_numeric(df["Ngày"], errors="coerce")
+    float_mask = numeric_dates.notna()
+
+    # Only the date key columns of each subset are needed, not a full copy
+    parsed_parts = []
 
     # Parse string dates
-    if not string_dates_df.empty:
-        string_dates_df["Parsed Ngày"] = string_dates_df.apply(
-            parse_date_robustly, axis=1
-        )
+    if not float_mask.all():
+        parsed_parts.append(parse_date_series(df.loc[~float_mask, DATE_KEY_COLUMNS]))
 
     # Convert Excel serial dates
-    if not float_dates_df.empty:
-        float_dates_df["Ngày"] = pd.to_numeric(float_dates_df["Ngày"], errors="coerce")
-        float_dates_df["Parsed Ngày"] = pd.to_datetime(
-            float_dates_df["Ngày"], unit="D", origin="1899-12-30", errors="coerce"
+    if float_mask.any():
+        parsed_parts.append(
+            pd.to_datetime(
+                numeric_dates[float_mask],
+                unit="D",
+                origin="1899-12-30",
+                errors="coerce",
+            )
         )
 
-    # Merge parsed dates back to main dataframe
-    processed_dates = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
-    if not string_dates_df.empty:
-        processed_dates.update(string_dates_df["Parsed Ngày"])
-    if not float_dates_df.empty:
-        processed_dates.update(float_dates_df["Parsed Ngày"])
+    # Merge parsed dates back to main dataframe (the two masks are disjoint,
+    # so one concat + reindex restores the original row order)
+    if parsed_parts:
+        processed_dates = pd.concat(parsed_parts).reindex(df.index)
+    else:
+        processed_dates = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
 
     df["Ngày"] = processed_dates
-    df["Ngày"] = pd.to_datetime(df["Ngày"], errors="coerce")
 
-    # Handle date mismatches with backward fill
-    verify_dates = pd.to_datetime(df["Ngày"], errors="coerce")
+    # Handle date mismatches with backward fill ('Ngày' is already datetime64,
+    # so it is checked directly rather than re-parsed)
+    verify_dates = processed_dates
     mismatch_mask = verify_dates.notna() & (
         (verify_dates.dt.year != df["_source_file_year"])
         | (verify_dates.dt.month != df["_source_file_month"])
@@ -444,52 +748,72 @@ def clean_dates(df: pd.DataFrame) -> pd.DataFrame:
         )
 
     # Enforce source year/month for remaining mismatches
-    verify_dates = pd.to_datetime(df["Ngày"], errors="coerce")
+    verify_dates = df["Ngày"]
     final_mismatch = verify_dates.notna() & (
         (verify_dates.dt.year != df["_source_file_year"])
         | (verify_dates.dt.month != df["_source_file_month"])
     )
 
     if final_mismatch.any():
-        for idx in df[final_mismatch].index:
-            try:
-                current_date = pd.to_datetime(df.loc[idx, "Ngày"], errors="coerce")
-                day = current_date.day if pd.notna(current_date) else 1
-                year = int(df.loc[idx, "_source_file_year"])
-                month = int(df.loc[idx, "_source_file_month"])
-
-                max_days = pd.Timestamp(year, month, 1).days_in_month
-                day = min(day, max_days)
-
-                df.loc[idx, "Ngày"] = datetime(year, month, day)
-            except (ValueError, TypeError):
-                df.loc[idx, "Ngày"] = datetime(
-                    int(df.loc[idx, "_source_file_year"]),
-                    int(df.loc[idx, "_source_file_month"]),
-                    1,
-                )
+        # Keep the day, clamped to the length of the source month
+        month_start = pd.to_datetime(
+            {
+                "year": df.loc[final_mismatch, "_source_file_year"].astype(int),
+                "month": df.loc[final_mismatch, "_source_file_month"].astype(int),
+                "day": 1,
+            }
+        )
+        day = verify_dates[final_mismatch].dt.day.clip(
+            upper=month_start.dt.days_in_month
+        )
+        df.loc[final_mismatch, "Ngày"] = month_start + pd.to_timedelta(
+            day - 1, unit="D"
+        )
 
         logger.info(f"Resolved {final_mismatch.sum()} year/month mismatches.")
 
-    # Format as ISO string
-    df["Ngày"] = df["Ngày"].dt.strftime("%Y-%m-%d").fillna("")
+    # 'Ngày' stays datetime64; it is formatted as ISO text only when saved
     return df
 
 
 def clean_text_column(series: pd.Series) -> pd.Series:
-    """Clean text: strip whitespace and normalize internal spaces."""
-    return series.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    """Clean text: strip whitespace and normalize internal spaces.
+
+    Product and supplier names repeat on many receipt lines, so only the
+    unique values are cleaned and the results are mapped back by code. The
+    uniques are joined into one NUL-separated buffer so the whitespace regex
+    runs once instead of once per value.
+    """
+    codes, uniques = pd.factorize(series.astype(str))
+    values = uniques.tolist()
+    buffer = "\x00".join(values)
+    if values and buffer.count("\x00") == len(values) - 1:
+        cleaned = [v.strip() for v in _WS_RE.sub(" ", buffer).split("\x00")]
+    else:
+        # Empty column, or values that already contain the separator
+        cleaned = uniques.str.strip().str.replace(_WS_RE, " ", regex=True)
+
+    return pd.Series(
+        pd.Index(cleaned, dtype=object).take(codes),
+        index=series.index,
+        name=series.name,
+    )
 
 
 def standardize_column_types(df: pd.DataFrame) -> pd.DataFrame:
-    """Apply consistent data types to all columns."""
+    """Apply consistent data types to all columns.
+
+    Each column group is converted in one batched call rather than one
+    whole-frame assignment per column.
+    """
     # Text columns
-    text_cols = ["Mã hàng", "Mã chứng từ", "Tên nhà cung cấp", "Tên hàng"]
-    for col in text_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str)
-            if col == "Mã hàng":
-                df[col] = df[col].str.upper()
+    text_cols = [col for col in TEXT_COLUMNS if col in df.columns]
+    if text_cols:
+        # Missing text is written as "<NA>", the string form of pd.NA
+        df[text_cols] = df[text_cols].fillna(pd.NA)
+        df = df.astype({col: str for col in text_cols})
+    if "Mã hàng" in df.columns:
+        df["Mã hàng"] = df["Mã hàng"].str.upper()
 
     # Clean specific text columns
     for col in ["Tên hàng", "Tên nhà cung cấp"]:
@@ -497,14 +821,16 @@ def standardize_column_types(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = clean_text_column(df[col])
 
     # Numeric columns
-    for col in ["Số lượng", "Đơn giá", "Thành tiền"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Integer columns
-    for col in ["Tháng", "Năm"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    numeric_cols = [col for col in NUMERIC_COLUMNS if col in df.columns]
+    if numeric_cols:
+        df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
+
+    # Integer columns (month and 4-digit year fit in 16 bits)
+    integer_cols = [col for col in INTEGER_COLUMNS if col in df.columns]
+    if integer_cols:
+        df[integer_cols] = (
+            df[integer_cols].apply(pd.to_numeric, errors="coerce").astype("Int16")
+        )
 
     return df
 
@@ -512,14 +838,13 @@ def standardize_column_types(df: pd.DataFrame) -> pd.DataFrame:
 def reorder_and_sort(df: pd.DataFrame) -> pd.DataFrame:
     """Reorder columns and sort by date and receipt ID."""
     # Reorder columns
+    # (column selection already returns a new frame; no extra copy needed)
     available_cols = [col for col in COLUMN_ORDER if col in df.columns]
-    df = df[available_cols].copy()
+    df = df[available_cols]
 
-    # Sort by date and receipt ID
+    # Sort by date and receipt ID ('Ngày' is already datetime64)
     if "Ngày" in df.columns:
-        df["_sort_date"] = pd.to_datetime(df["Ngày"], errors="coerce")
-        df = df.sort_values(by=["_sort_date", "Mã chứng từ"], na_position="last")
-        df = df.drop(columns=["_sort_date"])
+        df = df.sort_values(by=["Ngày", "Mã chứng từ"], na_position="last")
 
     return df
 
@@ -527,18 +852,22 @@ def reorder_and_sort(df: pd.DataFrame) -> pd.DataFrame:
 def generate_output_filename(df: pd.DataFrame) -> str:
     """Generate filename from date range in data."""
     if "Năm" in df.columns and "Tháng" in df.columns:
-        df["_source_date"] = pd.to_datetime(
-            df["Năm"].astype(str) + "-" + df["Tháng"].astype(str) + "-01",
+        # Assemble dates from the numeric parts; float keeps missing values as NaN
+        source_dates = pd.to_datetime(
+            {
+                "year": pd.to_numeric(df["Năm"], errors="coerce").astype("float64"),
+                "month": pd.to_numeric(df["Tháng"], errors="coerce").astype("float64"),
+                "day": 1,
+            },
             errors="coerce",
         )
-        min_date = df["_source_date"].min()
-        max_date = df["_source_date"].max()
+        min_date = source_dates.min()
+        max_date = source_dates.max()
 
         min_year, min_month = min_date.year, min_date.month
         max_year, max_month = max_date.year, max_date.month
 
         filename = f"Chi tiết nhập {min_year:04d}-{min_month:02d}_{max_year:04d}-{max_month:02d}.csv"
-        df.drop(columns=["_source_date"], inplace=True)
     else:
         filename = "Chi tiết nhập.csv"
 
@@ -551,13 +880,17 @@ def generate_output_filename(df: pd.DataFrame) -> str:
 
 
 def transform_purchase_receipts(
-    input_dir: Optional[Path] = None, output_dir: Optional[Path] = None
+    input_dir: Optional[Path] = None,
+    output_dir: Optional[Path] = None,
+    header_cache_path: Optional[Path] = None,
 ) -> Path:
     """Transform purchase receipt data from raw to staging.
 
     Args:
         input_dir: Path to raw directory (default: data/00-raw/import_export/)
         output_dir: Path to staging directory (default: data/01-staging/import_export/)
+        header_cache_path: JSON cache of extracted headers
+            (default: <output_dir>/.header_cache.json)
 
     Returns:
         Path: Output file path
@@ -571,6 +904,8 @@ def transform_purchase_receipts(
         input_dir = DATA_RAW_DIR
     if output_dir is None:
         output_dir = DATA_STAGING_DIR
+    if header_cache_path is None:
+        header_cache_path = output_dir / HEADER_CACHE_FILENAME
 
     # Find files matching pattern
     file_pattern = "*CT.NHAP.csv"
@@ -583,12 +918,14 @@ def transform_purchase_receipts(
     logger.info(f"Processing {len(matching_files)} file(s)")
 
     # Step 1: Load and extract headers
-    file_headers_map = load_and_extract_headers(matching_files)
+    file_headers_map = load_and_extract_headers(
+        matching_files, cache_path=header_cache_path
+    )
 
     # Step 2: Group files by header signature
     grouped_files = defaultdict(list)
     for file_path, (headers, indices) in file_headers_map.items():
-        grouped_files[tuple(headers)].append((file_path, indices))
+        grouped_files[headers].append((file_path, indices))
 
     # Step 3: Process each group
     merged_dataframes = {}
@@ -603,9 +940,11 @@ def transform_purchase_receipts(
         logger.warning("No data to process.")
         return None
 
-    # Step 4: Drop and rename columns first (before combining)
+    # Step 4: Drop and rename columns first (before combining). Raw group
+    # frames are popped so only one copy of each group is alive at a time.
     processed_groups = {}
-    for group_key, df in merged_dataframes.items():
+    for group_key in list(merged_dataframes):
+        df = merged_dataframes.pop(group_key)
         cols_to_drop = COLUMNS_TO_DROP["common"].copy()
         if "Group_2" in group_key:
             cols_to_drop.extend(COLUMNS_TO_DROP["group_2_specific"])
@@ -616,10 +955,9 @@ def transform_purchase_receipts(
             df = df.dropna(subset=["Số lượng"])
         processed_groups[group_key] = df
 
-    # Step 5: Combine all groups
-    final_combined_df = pd.concat(
-        [df for df in processed_groups.values()], ignore_index=True
-    )
+    # Step 5: Combine all groups (a single concat; groups are then released)
+    final_combined_df = pd.concat(list(processed_groups.values()), ignore_index=True)
+    processed_groups.clear()
 
     # Step 5.5: Fill null Đơn giá and Thành tiền with 0 for rows with non-null Số lượng
     for col in ["Đơn giá", "Thành tiền"]:
@@ -653,6 +991,10 @@ def transform_purchase_receipts(
     output_filename = generate_output_filename(final_combined_df)
     output_filepath = output_dir / output_filename
 
+    # Format dates as ISO strings only for the CSV
+    final_combined_df["Ngày"] = (
+        final_combined_df["Ngày"].dt.strftime("%Y-%m-%d").fillna("")
+    )
     final_combined_df.to_csv(output_filepath, index=False, encoding="utf-8")
     logger.info(f"Saved to: {output_filepath}")
     logger.info(
@@ -17,10 +17,13 @@ This script:
 """
 
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 # ============================================================================
@@ -35,6 +38,9 @@ DATA_STAGING_DIR = Path.cwd() / "data" / "01-staging" / "import_export"
 
 FILE_PATTERN = "*CT.XUAT.csv"
 
+# Files are parsed concurrently (pandas' C parser releases the GIL)
+MAX_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
 AUXILIARY_COLUMNS_TO_DROP = [
     "Số lượng_Bán lẻ",
     "PBH",
@@ -90,6 +96,9 @@ TEXT_COLUMNS = ["Mã hàng", "Mã chứng từ", "Tên khách hàng", "Tên hàn
 NUMERIC_COLUMNS = ["Số lượng", "Đơn giá", "Thành tiền"]
 INTEGER_COLUMNS = ["Tháng", "Năm"]
 
+_WS_RE = re.compile(r"\s+")
+_FILENAME_RE = re.compile(r"(\d{4})_(\d{1,2})_CT\.XUAT\.csv")
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -110,7 +119,7 @@ def extract_year_month_from_filename(
     filepath: Path,
 ) -> Tuple[Optional[int], Optional[int]]:
     """Extract year and month from filename in format 'YYYY_MM_CT.XUAT.csv'."""
-    match = re.search(r"(\d{4})_(\d{1,2})_CT\.XUAT\.csv", filepath.name)
+    match = _FILENAME_RE.search(filepath.name)
     if match:
         return int(match.group(1)), int(match.group(2))
     return None, None
@@ -119,10 +128,25 @@ def extract_year_month_from_filename(
 def read_header_lines(
     filepath: Path, num_lines: int = 5, encoding: str = "utf-8"
 ) -> Optional[List[str]]:
-    """Read first N lines from file with encoding fallback."""
+    """Read first N lines from file with encoding fallback.
+
+    The header bytes are read in one block and decoded once. Lines keep their
+    newline, and missing lines are returned as empty strings (as readline).
+    """
     try:
-        with open(filepath, "r", encoding=encoding) as f:
-            return [f.readline() for _ in range(num_lines)]
+        with open(filepath, "rb") as f:
+            head = b""
+            while head.count(b"\n") < num_lines:
+                chunk = f.read(65536)
+                if not chunk:
+                    break
+                head += chunk
+        end = -1
+        for _ in range(num_lines):
+            end = head.find(b"\n", end + 1)
+            if end == -1:
+                break
+        text = (head if end == -1 else head[: end + 1]).decode(encoding)
     except UnicodeDecodeError:
         if encoding == "utf-8":
             return read_header_lines(filepath, num_lines, encoding="latin1")
@@ -131,6 +155,11 @@ def read_header_lines(
         )
         return None
 
+    # Universal newlines, as in text mode
+    parts = text.replace("\r\n", "\n").replace("\r", "\n").split("\n", num_lines)
+    lines = ([part + "\n" for part in parts[:-1]] + [parts[-1]])[:num_lines]
+    return lines + [""] * (num_lines - len(lines))
+
 
 def combine_headers(header_row_4: pd.Series, header_row_5: pd.Series) -> List[str]:
     """Combine two header rows into single header list with uniqueness handling."""
@@ -148,18 +177,21 @@ def combine_headers(header_row_4: pd.Series, header_row_5: pd.Series) -> List[st
         else:
             combined_headers.append("Unnamed_Column")
 
-    # Ensure header uniqueness
+    # Ensure header uniqueness (a set backs the membership checks so the
+    # collision loop stays O(1) per probe)
     seen = {}
     unique_headers = []
+    used = set()
     for header_name in combined_headers:
         original_name = header_name
         count = seen.get(original_name, 0)
         if count > 0:
             header_name = f"{original_name}_{count}"
-        while header_name in unique_headers:
+        while header_name in used:
             count += 1
             header_name = f"{original_name}_{count}"
         unique_headers.append(header_name)
+        used.add(header_name)
         seen[original_name] = count + 1
 
     return unique_headers
@@ -198,6 +230,19 @@ def extract_and_combine_headers(filepath: Path) -> List[str]:
         return [f"Error_Processing_Headers_for_{filepath.name}"]
 
 
+def parse_unique_dates(values: pd.Series, fmt: str) -> pd.Series:
+    """Parse dates with one format, converting each distinct value only once.
+
+    Receipt files repeat the same date on every line, so the values are
+    factorized and only the uniques go through ``pd.to_datetime``.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(uniques, format=fmt, errors="coerce")
+    return pd.Series(
+        parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=values.index
+    )
+
+
 def process_dates(
     df: pd.DataFrame, year: Optional[int], month: Optional[int]
 ) -> pd.DataFrame:
@@ -212,7 +257,7 @@ def process_dates(
         return df
 
     # Attempt to parse date directly with standard format
-    df["Ngày_parsed"] = pd.to_datetime(df["Ngày"], format="%d/%m/%Y", errors="coerce")
+    df["Ngày_parsed"] = parse_unique_dates(df["Ngày"], "%d/%m/%Y")
 
     if year is not None and month is not None:
         # Extract day-only values
@@ -226,8 +271,8 @@ def process_dates(
                 day_only[needs_date_completion].astype(int).astype(str).str.zfill(2)
                 + f"/{month:02d}/{year}"
             )
-            df.loc[needs_date_completion, "Ngày_parsed"] = pd.to_datetime(
-                date_strings, format="%d/%m/%Y", errors="coerce"
+            df.loc[needs_date_completion, "Ngày_parsed"] = parse_unique_dates(
+                date_strings, "%d/%m/%Y"
             )
 
         # Default unparsed dates to day 1 of month/year from filename
@@ -240,7 +285,11 @@ def process_dates(
 
     df["Ngày_Year"] = df["Ngày_parsed"].dt.year
     df["Ngày_Month"] = df["Ngày_parsed"].dt.month
-    df["Ngày"] = df["Ngày_parsed"].dt.strftime("%Y-%m-%d").fillna("")
+    # ISO strings straight from NumPy's datetime64[D] cast (no per-row strftime)
+    days = df["Ngày_parsed"].to_numpy("datetime64[D]")
+    iso_dates = days.astype("U10").astype(object)
+    iso_dates[np.isnat(days)] = ""
+    df["Ngày"] = iso_dates
     df.drop(columns=["Ngày_parsed"], inplace=True)
 
     return df
@@ -260,7 +309,11 @@ def read_csv_file(filepath: Path, header_tuple: Tuple) -> Optional[pd.DataFrame]
                 names=list(header_tuple),
                 encoding=encoding,
                 sep=",",
-                engine="python",
+                engine="c",
+                # Infer dtypes over the whole file and parse floats exactly
+                # as Python does, matching the former python-engine output
+                low_memory=False,
+                float_precision="round_trip",
             )
             df["year_from_filename"] = year
             df["month_from_filename"] = month
@@ -303,8 +356,10 @@ def validate_date_consistency(df: pd.DataFrame) -> None:
 
 def validate_data_completeness(df: pd.DataFrame) -> None:
     """Check for sparse columns with less than 90% non-null values."""
-    non_null_percentage = (df.count() / len(df)) * 100
-    sparse_cols = non_null_percentage[non_null_percentage < 90].index.tolist()
+    if df.empty:
+        return
+    non_null_percentage = df.notna().to_numpy().sum(axis=0) / len(df) * 100
+    sparse_cols = df.columns[non_null_percentage < 90].tolist()
     if sparse_cols:
         logger.warning(
             f"{len(sparse_cols)} columns have less than 90% non-null values: {sparse_cols}"
@@ -312,8 +367,21 @@ def validate_data_completeness(df: pd.DataFrame) -> None:
 
 
 def clean_text_column(series: pd.Series) -> pd.Series:
-    """Clean text: strip whitespace and normalize internal spaces."""
-    return series.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    """Clean text: strip whitespace and normalize internal spaces.
+
+    Customer and product names repeat across receipt lines, so only the
+    unique values are cleaned and the results are mapped back by code.
+    """
+    codes, uniques = pd.factorize(series.astype(str))
+    cleaned = uniques.str.strip().str.replace(_WS_RE, " ", regex=True)
+    return pd.Series(cleaned.take(codes), index=series.index, name=series.name)
+
+
+def to_numeric_columns(df: pd.DataFrame, columns: List[str]) -> None:
+    """Coerce columns to numbers in place, skipping ones that already are."""
+    for col in columns:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
 
 def standardize_column_types(df: pd.DataFrame) -> pd.DataFrame:
@@ -330,10 +398,8 @@ def standardize_column_types(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = clean_text_column(df[col])
 
-    # Numeric columns
-    for col in NUMERIC_COLUMNS:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Numeric columns (already converted in process_groups for pipeline data)
+    to_numeric_columns(df, NUMERIC_COLUMNS)
 
     # Integer columns
     for col in INTEGER_COLUMNS:
@@ -348,25 +414,26 @@ def process_groups(
 ) -> pd.DataFrame:
     """Process each file group and combine into single DataFrame.
 
+    Files within a group are read concurrently; results keep the file order.
+
     Args:
         grouped_files: Dict mapping header tuples to file paths
     """
-    combined_dfs = {}
+    group_dfs = []
 
     for header_tuple, filepaths in grouped_files.items():
-        dfs_for_group = []
-        row_counter = 0
-
-        for filepath in filepaths:
-            df = read_csv_file(filepath, header_tuple)
-            if df is not None:
-                row_counter += len(df)
-                dfs_for_group.append(df)
+        with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+            loaded = executor.map(
+                lambda filepath: read_csv_file(filepath, header_tuple), filepaths
+            )
+            dfs_for_group = [df for df in loaded if df is not None]
 
         if not dfs_for_group:
             continue
 
         combined_df = pd.concat(dfs_for_group, ignore_index=True)
+        # Release the per-file frames now that the group is concatenated
+        del dfs_for_group
 
         # Conditional column renaming (header-pattern specific)
         if (
@@ -385,11 +452,13 @@ def process_groups(
         if "Chứng từ xuất_PXK" in combined_df.columns:
             combined_df.rename(columns={"Chứng từ xuất_PXK": "Chứng từ"}, inplace=True)
 
-        # Calculate quantity from Số lượng_Bán lẻ only
-        combined_df["Số lượng"] = pd.to_numeric(
-            combined_df.get("Số lượng_Bán lẻ", pd.Series(index=combined_df.index)),
-            errors="coerce",
-        ).fillna(0)
+        # Calculate quantity from Số lượng_Bán lẻ only (all zero when absent)
+        if "Số lượng_Bán lẻ" in combined_df.columns:
+            combined_df["Số lượng"] = pd.to_numeric(
+                combined_df["Số lượng_Bán lẻ"], errors="coerce"
+            ).fillna(0)
+        else:
+            combined_df["Số lượng"] = 0.0
 
         # Drop zero-quantity rows
         combined_df = combined_df[
@@ -406,13 +475,14 @@ def process_groups(
                 combined_df["Thành tiền"], errors="coerce"
             )
 
-        combined_dfs[header_tuple] = combined_df
+        group_dfs.append(combined_df)
+        del combined_df
 
-    return (
-        pd.concat(combined_dfs.values(), ignore_index=True)
-        if combined_dfs
-        else pd.DataFrame()
-    )
+    if not group_dfs:
+        return pd.DataFrame()
+    final_df = pd.concat(group_dfs, ignore_index=True)
+    group_dfs.clear()
+    return final_df
 
 
 def fill_and_adjust_rows(df: pd.DataFrame) -> pd.DataFrame:
@@ -426,33 +496,25 @@ def fill_and_adjust_rows(df: pd.DataFrame) -> pd.DataFrame:
     - Make 'Số lượng' negative and 'Đơn giá' positive
     """
     # Ensure numeric columns are properly typed
-    if "Số lượng" in df.columns:
-        df["Số lượng"] = pd.to_numeric(df["Số lượng"], errors="coerce")
-    if "Đơn giá" in df.columns:
-        df["Đơn giá"] = pd.to_numeric(df["Đơn giá"], errors="coerce")
-    if "Thành tiền" in df.columns:
-        df["Thành tiền"] = pd.to_numeric(df["Thành tiền"], errors="coerce")
+    to_numeric_columns(df, NUMERIC_COLUMNS)
 
     # Rows with non-null Số lượng
     non_null_qty = df["Số lượng"].notna()
 
-    # Fill null Đơn giá and Thành tiền with 0
-    if "Đơn giá" in df.columns:
-        df.loc[non_null_qty & df["Đơn giá"].isna(), "Đơn giá"] = 0
-    if "Thành tiền" in df.columns:
-        df.loc[non_null_qty & df["Thành tiền"].isna(), "Thành tiền"] = 0
-
-    # Fill null Tên khách hàng with 'KHÁCH LẺ'
-    if "Tên khách hàng" in df.columns:
-        df.loc[non_null_qty & df["Tên khách hàng"].isna(), "Tên khách hàng"] = (
-            "KHÁCH LẺ"
+    # Fill nulls on rows with Số lượng, all columns in one masked assignment
+    fill_values = {"Đơn giá": 0, "Thành tiền": 0, "Tên khách hàng": "KHÁCH LẺ"}
+    fill_cols = [col for col in fill_values if col in df.columns]
+    if fill_cols and non_null_qty.any():
+        df.loc[non_null_qty, fill_cols] = df.loc[non_null_qty, fill_cols].fillna(
+            fill_values
         )
 
     # For rows with positive Số lượng and negative Đơn giá
     if "Số lượng" in df.columns and "Đơn giá" in df.columns:
         pos_qty_neg_price = (df["Số lượng"] > 0) & (df["Đơn giá"] < 0)
-        df.loc[pos_qty_neg_price, "Số lượng"] = -df.loc[pos_qty_neg_price, "Số lượng"]
-        df.loc[pos_qty_neg_price, "Đơn giá"] = -df.loc[pos_qty_neg_price, "Đơn giá"]
+        if pos_qty_neg_price.any():
+            swap_cols = ["Số lượng", "Đơn giá"]
+            df.loc[pos_qty_neg_price, swap_cols] = -df.loc[pos_qty_neg_price, swap_cols]
 
     return df
 
@@ -515,10 +577,12 @@ def transform_sale_receipts(
 
     logger.info(f"Found {len(csv_files)} CSV files")
 
-    # Group files by header
+    # Group files by header (header lines are read concurrently, in file order)
+    with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+        headers = list(executor.map(extract_and_combine_headers, csv_files))
+
     grouped_files_by_header = {}
-    for filepath in csv_files:
-        combined_header = extract_and_combine_headers(filepath)
+    for filepath, combined_header in zip(csv_files, headers):
         header_tuple = tuple(combined_header)
         if header_tuple not in grouped_files_by_header:
             grouped_files_by_header[header_tuple] = []
@@ -561,11 +625,13 @@ def transform_sale_receipts(
 
     # Sort data
     if "Ngày" in final_df.columns and "Mã chứng từ" in final_df.columns:
-        final_df["Ngày_dt"] = pd.to_datetime(final_df["Ngày"], errors="coerce")
+        # 'Ngày' already holds ISO dates from process_dates (blank when
+        # unknown), so it sorts chronologically as text without re-parsing
+        final_df["Ngày_key"] = final_df["Ngày"].where(final_df["Ngày"] != "")
         final_df = final_df.sort_values(
-            by=["Ngày_dt", "Mã chứng từ"], na_position="last"
+            by=["Ngày_key", "Mã chứng từ"], na_position="last"
         )
-        final_df = final_df.drop(columns=["Ngày_dt"], errors="ignore")
+        final_df = final_df.drop(columns=["Ngày_key"], errors="ignore")
 
     # Step 6: Save output
     output_filepath = output_dir / output_filename
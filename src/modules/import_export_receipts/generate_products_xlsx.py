@@ -14,16 +14,17 @@ Pipeline stage: data/01-staging/ → Google Spreadsheet
 """
 
 import logging
+import re
 import toml
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 
 from src.erp.templates import ProductTemplate
-from src.utils.product_attributes import extract_attributes
+from src.utils.product_attributes import extract_attributes_series
 from src.utils.staging_cache import StagingCache
 from src.utils.xlsx_formatting import XLSXFormatter
 
@@ -50,6 +51,18 @@ CONFIG = {
     "products_sheet_name": "products_to_import",
 }
 
+# Misspelled brand (any case) -> standard spelling, fixed in one regex pass;
+# each alternative is a group so the replacement is picked by group number
+_BRAND_TYPOS = {
+    "chengsin": "CHENGSHIN",
+    "michenlin": "MICHELIN",
+    "caosumina": "CASUMINA",
+}
+_BRAND_TYPO_RE = re.compile(
+    "|".join(f"({re.escape(typo)})" for typo in _BRAND_TYPOS), re.IGNORECASE
+)
+_BRAND_FIXES = tuple(_BRAND_TYPOS.values())
+
 
 def find_latest_file(directory: Path, pattern: str) -> Optional[Path]:
     """Find the latest file matching pattern in directory."""
@@ -153,18 +166,15 @@ def fetch_product_lookup() -> pd.DataFrame:
 
 def standardize_brand_names(enrichment_df: pd.DataFrame) -> pd.DataFrame:
     """Standardize brand names in Tên hàng column."""
-    replacements = {
-        "chengsin": "CHENGSHIN",
-        "michenlin": "MICHELIN",
-        "caosumina": "CASUMINA",
-    }
-
     if "Tên hàng" not in enrichment_df.columns:
         return enrichment_df
 
     df = enrichment_df.copy()
-    for old, new in replacements.items():
-        df["Tên hàng"] = df["Tên hàng"].str.replace(old, new, case=False, regex=False)
+    df["Tên hàng"] = df["Tên hàng"].str.replace(
+        _BRAND_TYPO_RE,
+        lambda match: _BRAND_FIXES[match.lastindex - 1],
+        regex=True,
+    )
     return df
 
 
@@ -213,22 +223,55 @@ def get_product_names_from_nhap(nhap_df: pd.DataFrame) -> pd.DataFrame:
 
 def get_sort_key(ma_hang: str, nhap_df: pd.DataFrame) -> tuple:
     """Get sort key based on first occurrence date in nhập data."""
-    product_data = nhap_df[nhap_df["Mã hàng"] == ma_hang]
-    if product_data.empty:
-        return (pd.NaT, "", 0)
+    return get_sort_keys([ma_hang], nhap_df).get(ma_hang, (pd.NaT, "", 0))
 
-    first_row = product_data.iloc[0]
-    try:
-        date_val = pd.to_datetime(first_row.get("Ngày", ""), errors="coerce")
-    except Exception:
-        date_val = pd.NaT
-
-    return (
-        date_val,
-        str(first_row.get("Mã chứng từ", "")),
-        float(first_row.get("Thành tiền", 0) or 0),
+
+def get_sort_keys(products, nhap_df: pd.DataFrame) -> Dict[str, tuple]:
+    """Get sort keys for many products from their first row in nhập data.
+
+    Each product's first row is picked in one pass instead of filtering
+    nhap_df once per product. Products without rows are left out.
+
+    Args:
+        products: Product codes (Mã hàng) to build keys for
+        nhap_df: DataFrame with 'Mã hàng' and optionally 'Ngày',
+            'Mã chứng từ' and 'Thành tiền' columns
+
+    Returns:
+        Dict mapping Mã hàng to (date, Mã chứng từ, Thành tiền)
+    """
+    codes = nhap_df["Mã hàng"]
+    first_rows = nhap_df[codes.isin(products) & codes.notna()].drop_duplicates(
+        "Mã hàng"
     )
 
+    def column(name, default):
+        if name in first_rows.columns:
+            return first_rows[name].tolist()
+        return [default] * len(first_rows)
+
+    # Receipt dates repeat across products, so parse each distinct one once
+    parsed_dates = {}
+    sort_keys = {}
+    for ma_hang, date, document, amount in zip(
+        first_rows["Mã hàng"].tolist(),
+        column("Ngày", ""),
+        column("Mã chứng từ", ""),
+        column("Thành tiền", 0),
+    ):
+        if date not in parsed_dates:
+            try:
+                parsed_dates[date] = pd.to_datetime(date, errors="coerce")
+            except Exception:
+                parsed_dates[date] = pd.NaT
+        sort_keys[ma_hang] = (
+            parsed_dates[date],
+            str(document),
+            float(amount or 0),
+        )
+
+    return sort_keys
+
 
 def calculate_max_selling_price(xuat_df: pd.DataFrame) -> pd.DataFrame:
     """Calculate max selling price per product."""
@@ -296,16 +339,14 @@ def build_template_dataframe(
         if "Tên hàng" in df.columns:
             fallback_map = fallback_names.set_index("Mã hàng")["Tên hàng"].to_dict()
 
-            df["Tên hàng"] = df["Tên hàng"].fillna(pd.NA).replace("", pd.NA)
+            names = df["Tên hàng"].fillna(pd.NA).replace("", pd.NA)
 
-            df["Tên hàng"] = df.apply(
-                lambda row: (
-                    row["Tên hàng"]
-                    if pd.notna(row["Tên hàng"]) and row["Tên hàng"] != ""
-                    else fallback_map.get(row["Mã hàng"], "")
-                ),
-                axis=1,
+            # Look up fallbacks only for the rows that need one
+            missing = names.isna()
+            fallback = df.loc[missing, "Mã hàng"].map(
+                lambda ma_hang: fallback_map.get(ma_hang, "")
             )
+            df["Tên hàng"] = names.astype(object).where(~missing, fallback)
 
             fallback_count = (df["Tên hàng"].isin(fallback_map.values())).sum()
             logger.info(f"Applied fallback product names for {fallback_count} products")
@@ -513,8 +554,8 @@ def process(
         enrichment_df = standardize_brand_names(enrichment_df)
 
         if "Tên hàng" in enrichment_df.columns:
-            enrichment_df["Thuộc tính"] = enrichment_df["Tên hàng"].apply(
-                extract_attributes
+            enrichment_df["Thuộc tính"] = extract_attributes_series(
+                enrichment_df["Tên hàng"]
             )
         else:
             enrichment_df["Thuộc tính"] = ""
@@ -527,9 +568,7 @@ def process(
             "Mã hàng"
         ].unique()
 
-        sort_keys = {
-            ma_hang: get_sort_key(ma_hang, nhap_df) for ma_hang in unique_products
-        }
+        sort_keys = get_sort_keys(unique_products, nhap_df)
         sorted_products = sorted(
             unique_products, key=lambda x: sort_keys.get(x, (pd.NaT, "", 0))
         )
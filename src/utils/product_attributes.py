@@ -20,12 +20,16 @@ Features:
 
 Output formats:
 - extract_attributes(): Basic pipe-separated string
+- extract_attributes_series(): extract_attributes() over a pandas Series
 - extract_attributes_extended(): Dict with attributes + Vietnamese description
 """
 
 import logging
 import re
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +43,65 @@ DIMENSION_PATTERNS = {
     "bolt_pattern": r"(\d+)[xX-](\d+)",
 }
 
+_TIRE_FRACTIONAL_RE = re.compile(r"\b(\d+)/(\d+)-(\d+)\b")
+_TIRE_3PART_RE = re.compile(r"\b(\d+)/(\d+)/(\d+)\b")
+_TIRE_DECIMAL_RE = re.compile(r"\b(\d+\.\d+)-(\d+)\b")
+_TUBE_RANGE_RE = re.compile(r"\b(\d+\.\d+)/(\d+\.\d+)-(\d+)\b")
+_TUBE_SIMPLE_RE = re.compile(r"\b(\d{2,3})-(\d{2})\b")
+_FRENCH_SIZE_RE = re.compile(r"\b(\d+)x(\d+\.?\d*)\b")
+_AMERICAN_SIZE_RE = re.compile(r"\b(\d+)-(\d+)-(\d+)\b")
+_BOLT_PATTERN_RE = re.compile(r"\b(\d+)[xX-](\d+)\b")
+_DIMENSION_HINT_RE = re.compile(r"\d[/.xX-]\d")
+_DIGIT_RE = re.compile(r"\d")
+
+# Matched against the lower-cased name (see extract_attributes_extended)
+_FRONT_RE = re.compile(r"\b(?:trước|front|f)\b")
+_REAR_RE = re.compile(r"\b(?:sau|rear|r)\b")
+
+# T/L or TL (any case) means tubeless; TT (upper case only) or TR means tube type
+_TUBELESS_RE = re.compile(r"\bT/?L\b", re.IGNORECASE)
+_TIRE_CODE_RE = re.compile(r"(?P<tubeless>\b(?i:T/?L)\b)|\b(?:TT|(?i:TR))\b(?!\w)")
+
+_PLY_RATING_RE = re.compile(r"(\d+)pr")
+_LOAD_INDEX_RE = re.compile(r"(\d+)([A-ZÀ-Ỹ])\b")
+_REGION_SUFFIX_RE = re.compile(r"-([A-ZÀ-Ỹ]+(?:/[A-ZÀ-Ỹ]+)*)\b")
+_REGION_PAREN_RE = re.compile(r"\((\s*[A-ZÀ-Ỹ]+(?:,\s*[A-ZÀ-Ỹ]+)\s*)\)")
+# "VN, TH" -> "VN/TH": commas become slashes and spaces are dropped
+_REGION_SEPARATORS = str.maketrans({",": "/", " ": ""})
+# Same patterns restricted to A-Z: equivalent on pure-ASCII names, and cheaper
+_LOAD_INDEX_ASCII_RE = re.compile(r"(\d+)([A-Z])\b")
+_REGION_SUFFIX_ASCII_RE = re.compile(r"-([A-Z]+(?:/[A-Z]+)*)\b")
+_REGION_PAREN_ASCII_RE = re.compile(r"\((\s*[A-Z]+(?:,\s*[A-Z]+)\s*)\)")
+_BATTERY_CODE_RE = re.compile(r"\b(ytz|wtz|wp|yb\dl|yb\d)\b")
+_BATTERY_VOLTAGE_RE = re.compile(r"(\d+)[vV]")
+_OIL_VOLUME_RE = re.compile(r"(\d+\.?\d*)\s*(ml|l)\b")
+# Oil brands in priority order (first one contained in the name wins)
+_OIL_BRANDS = (
+    "HONDA",
+    "YAMAHA",
+    "PIAGIO",
+    "SUZUKI",
+    "CASTROL",
+    "SHELL",
+    "MOTUL",
+    "TOTAL",
+    "THẮNG MEKONG",
+    "VISTRA",
+    "POWER",
+    "TABET",
+    "ACTIVE",
+)
+_BELT_LENGTH_RE = re.compile(
+    r"(?:dây\s*curoa|curoa|dây\s*passer|dây\s*ga).*?(\d{3,4})\b"
+)
+
+_EXPLAIN_METRIC_RE = re.compile(r"^(\d+\.?\d*)/(\d+\.?\d*)[-/](\d+)$")
+_EXPLAIN_INCH_RE = re.compile(r"^(\d+\.\d+)-(\d+)$")
+_EXPLAIN_FRENCH_RE = re.compile(r"^(\d+)[x*](\d+\.?\d*[A-Z]?)$")
+_EXPLAIN_AMERICAN_RE = re.compile(r"^(\d+)-(\d+)-(\d+)$")
+_EXPLAIN_BOLT_RE = re.compile(r"^(\d+)[xX-](\d+)$")
+_EXPLAIN_TUBE_RE = re.compile(r"^(\d{2,3})-(\d{2})$")
+
 
 def extract_attributes(name: str) -> str:
     """Extract basic product attributes (legacy function for backward compatibility).
@@ -52,7 +115,12 @@ def extract_attributes(name: str) -> str:
     """
     if not name or not isinstance(name, str):
         return ""
+    return _extract_attributes_cached(name)
+
 
+@lru_cache(maxsize=65536)
+def _extract_attributes_cached(name: str) -> str:
+    """Memoized body of extract_attributes (product names repeat heavily)."""
     name = name.strip()
     if not name:
         return ""
@@ -63,13 +131,35 @@ def extract_attributes(name: str) -> str:
     if dimension:
         attributes.append(f"Kích thước:{dimension}")
 
-    tire_type = _extract_tire_type(name)
+    tire_type = _extract_tire_type(name, dimension is not None)
     if tire_type:
         attributes.append(f"Loại vỏ:{tire_type}")
 
     return "|".join(attributes) if attributes else ""
 
 
+def extract_attributes_series(names: pd.Series) -> pd.Series:
+    """Apply extract_attributes to every name in a Series.
+
+    Product names repeat across rows, so each distinct name is extracted once
+    and the results are mapped back by position.
+
+    Args:
+        names: Series of product names (non-strings yield "")
+
+    Returns:
+        Series of attribute strings aligned to ``names``
+    """
+    codes, uniques = pd.factorize(names)
+    # factorize codes missing values as -1, which takes the trailing ""
+    extracted = [extract_attributes(name) for name in uniques] + [""]
+    return pd.Series(
+        pd.Index(extracted, dtype=object).take(codes),
+        index=names.index,
+        name=names.name,
+    )
+
+
 def extract_attributes_extended(name: str) -> Dict[str, str]:
     """Extract all product attributes and generate Vietnamese description.
 
@@ -84,25 +174,44 @@ def extract_attributes_extended(name: str) -> Dict[str, str]:
     if not name or not isinstance(name, str):
         return {"Thuộc tính": "", "Mô tả": ""}
 
+    # The cache holds immutable tuples; every caller gets a fresh dict
+    attributes_str, description = _extract_attributes_extended_cached(name)
+    return {
+        "Thuộc tính": attributes_str,
+        "Mô tả": description,
+    }
+
+
+@lru_cache(maxsize=65536)
+def _extract_attributes_extended_cached(name: str) -> Tuple[str, str]:
+    """Memoized body of extract_attributes_extended as (attributes, description)."""
     attributes = {}
+    # Case-insensitive extractors share one lower-cased copy of the name
+    name_lower = name.lower()
 
-    dimension = _extract_dimension(name)
+    # Sizes, ratings, voltages, volumes and lengths all need a digit; many
+    # accessory names have none, so those extractors are skipped outright
+    has_digit = _DIGIT_RE.search(name) is not None
+
+    dimension, dimension_kind = (
+        _extract_dimension_with_kind(name) if has_digit else (None, None)
+    )
     if dimension:
         attributes["Kích thước"] = dimension
 
-    tire_type = _extract_tire_type(name)
+    tire_type = _extract_tire_type(name, dimension is not None)
     if tire_type:
         attributes["Loại vỏ"] = tire_type
 
-    position = _extract_position(name)
+    position = _extract_position(name_lower)
     if position:
         attributes["Vị trí"] = position
 
-    ply_rating = _extract_ply_rating(name)
+    ply_rating = _extract_ply_rating(name_lower) if has_digit else None
     if ply_rating:
         attributes["Chỉ số PR"] = f"{ply_rating}PR"
 
-    load_index = _extract_load_index(name)
+    load_index = _extract_load_index(name) if has_digit else None
     if load_index:
         attributes["Chỉ số tải"] = load_index
 
@@ -110,15 +219,15 @@ def extract_attributes_extended(name: str) -> Dict[str, str]:
     if region_code:
         attributes["Khu vực"] = region_code
 
-    battery_code = _extract_battery_code(name)
+    battery_code = _extract_battery_code(name_lower)
     if battery_code:
         attributes["Mã bình"] = battery_code
 
-    battery_voltage = _extract_battery_voltage(name)
+    battery_voltage = _extract_battery_voltage(name) if has_digit else None
     if battery_voltage:
         attributes["Điện áp"] = battery_voltage
 
-    oil_volume = _extract_oil_volume(name)
+    oil_volume = _extract_oil_volume(name_lower) if has_digit else None
     if oil_volume:
         attributes["Dung tích nhớt"] = oil_volume
 
@@ -126,206 +235,190 @@ def extract_attributes_extended(name: str) -> Dict[str, str]:
     if oil_brand:
         attributes["Thương hiệu nhớt"] = oil_brand
 
-    belt_length = _extract_belt_length(name)
+    belt_length = _extract_belt_length(name_lower) if has_digit else None
     if belt_length:
         attributes["Chiều dây curoa"] = belt_length
 
     attributes_str = "|".join([f"{k}:{v}" for k, v in attributes.items()])
-    description = _generate_description(attributes)
+    description = _generate_description(attributes, dimension_kind)
 
-    return {
-        "Thuộc tính": attributes_str,
-        "Mô tả": description,
-    }
+    return attributes_str, description
 
 
 def _extract_dimension(name: str) -> Optional[str]:
-    dimension = _extract_tire_fractional(name)
-    if dimension:
-        return dimension
-
-    dimension = _extract_tire_3part(name)
-    if dimension:
-        return dimension
-
-    dimension = _extract_tube_range(name)
-    if dimension:
-        return dimension
+    return _extract_dimension_with_kind(name)[0]
 
-    dimension = _extract_tire_decimal(name)
-    if dimension:
-        return dimension
 
-    dimension = _extract_french_size(name)
-    if dimension:
-        return dimension
+def _extract_dimension_with_kind(name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the first matching dimension and its _explain_dimension kind."""
+    # Every dimension shape contains a digit-separator-digit run; names without
+    # one (oil, batteries, belts, ...) skip the whole cascade
+    if not _DIMENSION_HINT_RE.search(name):
+        return None, None
 
-    dimension = _extract_american_size(name)
-    if dimension:
-        return dimension
+    for extract, kind in _DIMENSION_EXTRACTORS:
+        dimension = extract(name)
+        if dimension:
+            return dimension, kind
 
-    dimension = _extract_bolt_pattern(name)
-    if dimension:
-        return dimension
-
-    dimension = _extract_tube_simple(name)
-    if dimension:
-        return dimension
-
-    return None
+    return None, None
 
 
 def _extract_tire_fractional(name: str) -> Optional[str]:
-    pattern = r"\b(\d+)/(\d+)-(\d+)\b"
-    match = re.search(pattern, name)
+    match = _TIRE_FRACTIONAL_RE.search(name)
     if match:
         return f"{match.group(1)}/{match.group(2)}-{match.group(3)}"
     return None
 
 
 def _extract_tire_3part(name: str) -> Optional[str]:
-    pattern = r"\b(\d+)/(\d+)/(\d+)\b"
-    match = re.search(pattern, name)
+    match = _TIRE_3PART_RE.search(name)
     if match:
         return f"{match.group(1)}/{match.group(2)}/{match.group(3)}"
     return None
 
 
 def _extract_tire_decimal(name: str) -> Optional[str]:
-    pattern = r"\b(\d+\.\d+)-(\d+)\b"
-    match = re.search(pattern, name)
+    match = _TIRE_DECIMAL_RE.search(name)
     if match:
         return f"{match.group(1)}-{match.group(2)}"
     return None
 
 
 def _extract_tube_range(name: str) -> Optional[str]:
-    pattern = r"\b(\d+\.\d+)/(\d+\.\d+)-(\d+)\b"
-    match = re.search(pattern, name)
+    match = _TUBE_RANGE_RE.search(name)
     if match:
         return f"{match.group(1)}/{match.group(2)}-{match.group(3)}"
     return None
 
 
 def _extract_tube_simple(name: str) -> Optional[str]:
-    pattern = r"\b(\d{2,3})-(\d{2})\b"
-    match = re.search(pattern)
-
+    match = _TUBE_SIMPLE_RE.search(name)
     if match and not _extract_french_size(name):
         return f"{match.group(1)}-{match.group(2)}"
     return None
 
 
 def _extract_french_size(name: str) -> Optional[str]:
-    pattern = r"\b(\d+)x(\d+\.?\d*)\b"
-    match = re.search(pattern, name)
+    match = _FRENCH_SIZE_RE.search(name)
     if match:
         return f"{match.group(1)}x{match.group(2)}"
     return None
 
 
 def _extract_american_size(name: str) -> Optional[str]:
-    pattern = r"\b(\d+)-(\d+)-(\d+)\b"
-    match = re.search(pattern)
-
+    match = _AMERICAN_SIZE_RE.search(name)
     if match:
         return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
     return None
 
 
 def _extract_bolt_pattern(name: str) -> Optional[str]:
-    pattern = r"\b(\d+)[xX-](\d+)\b"
-    match = re.search(pattern, name)
+    match = _BOLT_PATTERN_RE.search(name)
     if match:
         return f"{match.group(1)}x{match.group(2)}"
     return None
 
 
-def _extract_position(name: str) -> Optional[str]:
-    if not name or not isinstance(name, str):
-        return None
+# Dimension extractors in priority order (first match wins), each paired
+# with the _explain_dimension branch its output lands in: bolt patterns are
+# written "AxB" and read as French sizes, simple tube sizes "AA-BB" as bolts
+_DIMENSION_EXTRACTORS = (
+    (_extract_tire_fractional, "metric"),
+    (_extract_tire_3part, "metric"),
+    (_extract_tube_range, "metric"),
+    (_extract_tire_decimal, "inch"),
+    (_extract_french_size, "french"),
+    (_extract_american_size, "american"),
+    (_extract_bolt_pattern, "french"),
+    (_extract_tube_simple, "bolt"),
+)
 
-    name_upper = name.upper()
-    front_patterns = [r"\bTRƯỚC\b", r"\bFRONT\b", r"\bF\b(?![a-z])"]
-    rear_patterns = [r"\bSAU\b", r"\bREAR\b", r"\bR\b(?![a-z])"]
 
-    for pattern in front_patterns:
-        if re.search(pattern, name_upper, re.IGNORECASE):
-            return "Vỏ trước"
+def _extract_position(name_lower: str) -> Optional[str]:
+    if not name_lower or not isinstance(name_lower, str):
+        return None
 
-    for pattern in rear_patterns:
-        if re.search(pattern, name_upper, re.IGNORECASE):
-            return "Vỏ sau"
+    if _FRONT_RE.search(name_lower):
+        return "Vỏ trước"
 
-    return None
+    if _REAR_RE.search(name_lower):
+        return "Vỏ sau"
 
+    return None
 
-def _extract_tire_type(name: str) -> Optional[str]:
-    tire_keywords = [r"vỏ", r"lốp", r"tyre", r"tire"]
-    has_tire_keyword = any(re.search(kw, name, re.IGNORECASE) for kw in tire_keywords)
-    has_dimension = _extract_dimension(name) is not None
 
-    if not has_tire_keyword and not has_dimension:
+def _extract_tire_type(name: str, has_dimension: bool) -> Optional[str]:
+    if not has_dimension:
+        # Plain substring checks on one lowered copy beat a regex here
+        name_lower = name.lower()
+        if not (
+            "vỏ" in name_lower
+            or "lốp" in name_lower
+            or "tyre" in name_lower
+            or "tire" in name_lower
+        ):
+            return None
+
+    # One scan finds the leftmost code; a tube-type hit only stands if no
+    # tubeless code follows it, since tubeless takes precedence
+    match = _TIRE_CODE_RE.search(name)
+    if match is None:
         return None
-
-    if re.search(r"\b(T/?L)\b", name, re.IGNORECASE):
-        return "Không ruột"
-
-    if re.search(r"\b(TL)\b(?!\w)", name, re.IGNORECASE):
+    if match.group("tubeless") or _TUBELESS_RE.search(name, match.end()):
         return "Không ruột"
-
-    if re.search(r"\b(TT)\b(?!\w)", name):
-        return "Có ruột"
-
-    if re.search(r"\b(TR)\b(?!\w)", name, re.IGNORECASE):
-        return "Có ruột"
-
-    return None
+    return "Có ruột"
 
 
-def _extract_ply_rating(name: str) -> Optional[int]:
-    match = re.search(r"(\d+)PR", name, re.IGNORECASE)
+def _extract_ply_rating(name_lower: str) -> Optional[int]:
+    match = _PLY_RATING_RE.search(name_lower)
     if match:
         return int(match.group(1))
     return None
 
 
 def _extract_load_index(name: str) -> Optional[str]:
-    match = re.search(r"(\d+)([A-ZÀ-Ỹ])\b", name)
+    pattern = _LOAD_INDEX_ASCII_RE if name.isascii() else _LOAD_INDEX_RE
+    match = pattern.search(name)
     if match and "PR" not in match.group(0):
         return f"{match.group(1)}{match.group(2)}"
     return None
 
 
 def _extract_region_code(name: str) -> Optional[str]:
-    match = re.search(r"-([A-ZÀ-Ỹ]+(?:/[A-ZÀ-Ỹ]+)*)\b", name)
+    if name.isascii():
+        suffix_re, paren_re = _REGION_SUFFIX_ASCII_RE, _REGION_PAREN_ASCII_RE
+    else:
+        suffix_re, paren_re = _REGION_SUFFIX_RE, _REGION_PAREN_RE
+
+    match = suffix_re.search(name)
     if match:
         return match.group(1)
 
-    match = re.search(r"\((\s*[A-ZÀ-Ỹ]+(?:,\s*[A-ZÀ-Ỹ]+)\s*)\)", name)
+    match = paren_re.search(name)
     if match:
-        region = match.group(1).replace(", ", "/").replace(",", "/").replace(" ", "")
+        region = match.group(1).translate(_REGION_SEPARATORS)
         return region
 
     return None
 
 
-def _extract_battery_code(name: str) -> Optional[str]:
-    match = re.search(r"\b(YTZ|WTZ|WP|YB\dL|YB\d)\b", name, re.IGNORECASE)
+def _extract_battery_code(name_lower: str) -> Optional[str]:
+    match = _BATTERY_CODE_RE.search(name_lower)
     if match:
         return match.group(1).upper()
     return None
 
 
 def _extract_battery_voltage(name: str) -> Optional[str]:
-    match = re.search(r"(\d+)[vV]", name)
+    match = _BATTERY_VOLTAGE_RE.search(name)
     if match:
         return f"{match.group(1)}V"
     return None
 
 
-def _extract_oil_volume(name: str) -> Optional[str]:
-    match = re.search(r"(\d+\.?\d*)\s*(ml|l)\b", name, re.IGNORECASE)
+def _extract_oil_volume(name_lower: str) -> Optional[str]:
+    match = _OIL_VOLUME_RE.search(name_lower)
     if match:
         volume = match.group(1)
         unit = match.group(2).upper()
@@ -334,90 +427,51 @@ def _extract_oil_volume(name: str) -> Optional[str]:
 
 
 def _extract_oil_brand(name: str) -> Optional[str]:
-    oil_brands = [
-        "HONDA",
-        "YAMAHA",
-        "PIAGIO",
-        "SUZUKI",
-        "CASTROL",
-        "SHELL",
-        "MOTUL",
-        "TOTAL",
-        "THẮNG MEKONG",
-        "VISTRA",
-        "POWER",
-        "TABET",
-        "ACTIVE",
-    ]
-
-    for brand in oil_brands:
-        if brand in name.upper():
+    name_upper = name.upper()
+    for brand in _OIL_BRANDS:
+        if brand in name_upper:
             return brand
     return None
 
 
-def _extract_belt_length(name: str) -> Optional[str]:
-    match = re.search(
-        r"(?:dây\s*curoa|curoa|dây\s*passer|dây\s*ga).*?(\d{3,4})\b",
-        name,
-        re.IGNORECASE,
-    )
+def _extract_belt_length(name_lower: str) -> Optional[str]:
+    match = _BELT_LENGTH_RE.search(name_lower)
     if match:
         return match.group(1)
     return None
 
 
-def _explain_dimension(dimension: str) -> str:
+def _explain_dimension(dimension: str, kind: Optional[str] = None) -> str:
     if not dimension:
         return ""
 
+    if kind is not None:
+        # Extracted dimensions have a known shape, so split instead of parsing
+        return _DIMENSION_EXPLAINERS[kind](dimension)
+
     dimension = dimension.strip()
 
-    match = re.search(r"^(\d+\.?\d*)/(\d+\.?\d*)[-/](\d+)$", dimension)
+    match = _EXPLAIN_METRIC_RE.search(dimension)
     if match:
-        width = match.group(1)
-        height = match.group(2)
-        rim = match.group(3)
+        return _explain_metric(*match.groups())
 
-        width_mm = width.replace(".", ",") if "." in width else width
-        height_mm = height.replace(".", ",") if "." in height else height
-
-        return f"Kích thước lốp: rộng {width_mm} milimét, cao {height_mm} milimét, đường kính {rim} insơ"
-
-    match = re.search(r"^(\d+\.\d+)-(\d+)$", dimension)
+    match = _EXPLAIN_INCH_RE.search(dimension)
     if match:
-        width = match.group(1)
-        rim = match.group(2)
-
-        width_in = width.replace(".", ",")
-        return f"Kích thước lốp: rộng {width_in} insơ, đường kính {rim} insơ"
+        return _explain_inch(*match.groups())
 
-    match = re.search(r"^(\d+)[x*](\d+\.?\d*[A-Z]?)$", dimension)
+    match = _EXPLAIN_FRENCH_RE.search(dimension)
     if match:
-        rim = match.group(1)
-        width = match.group(2).rstrip("A-Z")
-
-        width_in = width.replace(".", ",") if "." in width else width
-        return f"Kích thước lốp: đường kính {rim} insơ, rộng {width_in} insơ"
+        return _explain_french(match.group(1), match.group(2).rstrip("A-Z"))
 
-    match = re.search(r"^(\d+)-(\d+)-(\d+)$", dimension)
+    match = _EXPLAIN_AMERICAN_RE.search(dimension)
     if match:
-        width = match.group(1)
-        rim = match.group(2)
-        pattern = match.group(3)
-
-        return (
-            f"Kích thước lốp: rộng {width} insơ, đường kính {rim} insơ, mẫu {pattern}"
-        )
+        return _explain_american(*match.groups())
 
-    match = re.search(r"^(\d+)[xX-](\d+)$", dimension)
+    match = _EXPLAIN_BOLT_RE.search(dimension)
     if match:
-        pattern = match.group(1)
-        rim = match.group(2)
-
-        return f"Kích thước lốp: mẫu {pattern}, đường kính {rim} milimét"
+        return _explain_bolt(*match.groups())
 
-    match = re.search(r"^(\d{2,3})-(\d{2})$", dimension)
+    match = _EXPLAIN_TUBE_RE.search(dimension)
     if match:
         width = match.group(1)
         rim = match.group(2)
@@ -427,53 +481,84 @@ def _explain_dimension(dimension: str) -> str:
     return f"Kích thước lốp: {dimension}"
 
 
-def _generate_description(attributes: Dict[str, any]) -> str:
-    description_parts = []
+def _vn_decimal(number: str) -> str:
+    # Dimension parts carry at most one decimal point; Vietnamese uses a comma
+    return number.replace(".", ",", 1)
 
-    dimension = attributes.get("Kích thước")
-    if dimension:
-        description_parts.append(_explain_dimension(dimension))
 
-    tire_type = attributes.get("Loại vỏ")
-    if tire_type:
-        description_parts.append(f"Loại lốp: {tire_type}")
+def _explain_metric(width: str, height: str, rim: str) -> str:
+    width_mm = _vn_decimal(width)
+    height_mm = _vn_decimal(height)
 
-    position = attributes.get("Vị trí")
-    if position:
-        description_parts.append(f"Vị trí: {position}")
+    return f"Kích thước lốp: rộng {width_mm} milimét, cao {height_mm} milimét, đường kính {rim} insơ"
 
-    ply = attributes.get("Chỉ số PR")
-    if ply:
-        description_parts.append(f"Chỉ số chịu tải: {ply} lớp")
 
-    load_index = attributes.get("Chỉ số tải")
-    if load_index:
-        description_parts.append(f"Chỉ số tải: {load_index}")
+def _explain_inch(width: str, rim: str) -> str:
+    width_in = _vn_decimal(width)
+    return f"Kích thước lốp: rộng {width_in} insơ, đường kính {rim} insơ"
 
-    region = attributes.get("Khu vực")
-    if region:
-        region_text = region.replace("/", " và ")
-        description_parts.append(f"Khu vực: {region_text}")
 
-    battery_code = attributes.get("Mã bình")
-    if battery_code:
-        description_parts.append(f"Mã bình: {battery_code}")
+def _explain_french(rim: str, width: str) -> str:
+    width_in = _vn_decimal(width)
+    return f"Kích thước lốp: đường kính {rim} insơ, rộng {width_in} insơ"
 
-    battery_voltage = attributes.get("Điện áp")
-    if battery_voltage:
-        description_parts.append(f"Điện áp: {battery_voltage}")
 
-    oil_volume = attributes.get("Dung tích nhớt")
-    if oil_volume:
-        volume = oil_volume.replace("L", " lít").replace("ML", " mililít")
-        description_parts.append(f"Dung tích: {volume}")
+def _explain_american(width: str, rim: str, pattern: str) -> str:
+    return f"Kích thước lốp: rộng {width} insơ, đường kính {rim} insơ, mẫu {pattern}"
 
-    oil_brand = attributes.get("Thương hiệu nhớt")
-    if oil_brand:
-        description_parts.append(f"Thương hiệu: {oil_brand}")
 
-    belt_length = attributes.get("Chiều dây curoa")
-    if belt_length:
-        description_parts.append(f"Chiều dài dây curoa: {belt_length}")
+def _explain_bolt(pattern: str, rim: str) -> str:
+    return f"Kích thước lốp: mẫu {pattern}, đường kính {rim} milimét"
+
+
+def _split_metric(dimension: str) -> str:
+    # W/H-D, W/H/D or W.W/H.H-D: the rim follows the last separator
+    width, rest = dimension.split("/", 1)
+    cut = max(rest.rfind("-"), rest.rfind("/"))
+    return _explain_metric(width, rest[:cut], rest[cut + 1 :])
+
+
+_DIMENSION_EXPLAINERS = {
+    "metric": _split_metric,
+    "inch": lambda dimension: _explain_inch(*dimension.split("-")),
+    "french": lambda dimension: _explain_french(*dimension.split("x")),
+    "american": lambda dimension: _explain_american(*dimension.split("-")),
+    "bolt": lambda dimension: _explain_bolt(*dimension.split("-")),
+}
+
+
+# Description sentence for each attribute after the dimension, in output order
+_DESCRIPTION_FIELDS = (
+    ("Loại vỏ", "Loại lốp: {}".format),
+    ("Vị trí", "Vị trí: {}".format),
+    ("Chỉ số PR", "Chỉ số chịu tải: {} lớp".format),
+    ("Chỉ số tải", "Chỉ số tải: {}".format),
+    ("Khu vực", lambda region: f"Khu vực: {region.replace('/', ' và ')}"),
+    ("Mã bình", "Mã bình: {}".format),
+    ("Điện áp", "Điện áp: {}".format),
+    (
+        "Dung tích nhớt",
+        lambda volume: (
+            "Dung tích: " + volume.replace("L", " lít").replace("ML", " mililít")
+        ),
+    ),
+    ("Thương hiệu nhớt", "Thương hiệu: {}".format),
+    ("Chiều dây curoa", "Chiều dài dây curoa: {}".format),
+)
+
+
+def _generate_description(
+    attributes: Dict[str, any], dimension_kind: Optional[str] = None
+) -> str:
+    description_parts = []
+
+    dimension = attributes.get("Kích thước")
+    if dimension:
+        description_parts.append(_explain_dimension(dimension, dimension_kind))
+
+    for key, describe in _DESCRIPTION_FIELDS:
+        value = attributes.get(key)
+        if value:
+            description_parts.append(describe(value))
 
-    return ". ".join(description_parts) if description_parts else ""
+    return ". ".join(description_parts)
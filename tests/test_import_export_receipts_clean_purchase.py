@@ -1,13 +1,23 @@
 """Tests for src/modules/import_export_receipts/clean_receipts_purchase.py."""
 
+import csv
+import json
+
 import pandas as pd
 
 from src.modules.import_export_receipts.clean_receipts_purchase import (
+    HEADER_CACHE_VERSION,
     combine_headers,
+    load_and_extract_headers,
+    process_group_data,
     is_float_check,
     try_parse_date,
+    parse_date_robustly,
+    parse_date_series,
+    clean_dates,
     clean_text_column,
     standardize_column_types,
+    generate_output_filename,
 )
 
 
@@ -37,6 +47,82 @@ class TestCombineHeaders:
         assert "Chứng từ_Ngày" in headers[1]
 
 
+class TestProcessGroupData:
+    """Test load_and_extract_headers and process_group_data on CSV files."""
+
+    def _write_csv(self, path, data_rows):
+        header_row1 = ["CT"] + ["col"] * 28
+        header_row2 = ["PNK", "Ngày"] + ["sub"] * 27
+        rows = [["title"], [], [], header_row1, header_row2] + data_rows
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+    def test_ragged_rows_are_padded(self, tmp_path):
+        """Rows trimmed of trailing empty cells keep column alignment."""
+        file_path = tmp_path / "2024_03_XNT_CT.NHAP.csv"
+        full_row = [str(i) for i in range(29)]
+        self._write_csv(file_path, [full_row, ["PN1", "01/03/2024", "", "NCC"]])
+
+        headers_map = load_and_extract_headers([file_path])
+        headers, indices = headers_map[file_path]
+        result = process_group_data([(file_path, indices)], headers)
+
+        assert len(result) == 2
+        assert result.iloc[0, 19] == "28"
+        assert result.iloc[1, 0] == "PN1"
+        assert result.iloc[1, 3] == "NCC"
+        assert pd.isna(result.iloc[1, 2])
+        assert pd.isna(result.iloc[1, 19])
+        assert (result["_source_file_month"] == 3).all()
+        assert (result["_source_file_year"] == 2024).all()
+
+    def test_wide_first_row_keeps_alignment(self, tmp_path):
+        """A first data row wider than the sub-header does not shift columns."""
+        file_path = tmp_path / "2024_03_XNT_CT.NHAP.csv"
+        wide_row = ["PN1", "01/03/2024"] + [str(i) for i in range(2, 31)]
+        self._write_csv(file_path, [wide_row, ["PN2", "02/03/2024", "", "NCC"]])
+
+        headers_map = load_and_extract_headers([file_path])
+        headers, indices = headers_map[file_path]
+        result = process_group_data([(file_path, indices)], headers)
+
+        assert len(result) == 2
+        assert result.iloc[0, 0] == "PN1"
+        assert result.iloc[0, 1] == "01/03/2024"
+        assert result.iloc[0, 2] == "2"
+        assert result.iloc[1, 0] == "PN2"
+        assert result.iloc[1, 3] == "NCC"
+
+    def test_header_cache_skips_unchanged_files(self, tmp_path):
+        """Cached headers are reused until the file changes."""
+        file_path = tmp_path / "2024_03_XNT_CT.NHAP.csv"
+        self._write_csv(file_path, [["PN1", "01/03/2024"]])
+        cache_path = tmp_path / "staging" / ".header_cache.json"
+
+        first = load_and_extract_headers([file_path], cache_path=cache_path)
+        assert cache_path.exists()
+
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+        entry = next(iter(cache["files"].values()))
+        entry["headers"], entry["indices"] = ["cached"], [0]
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+        cached = load_and_extract_headers([file_path], cache_path=cache_path)
+        assert cached[file_path] == (("cached",), (0,))
+
+        cache["version"] = HEADER_CACHE_VERSION + 1
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        stale = load_and_extract_headers([file_path], cache_path=cache_path)
+        assert stale[file_path] == first[file_path]
+
+        self._write_csv(file_path, [["PN1", "01/03/2024"], ["PN2", "02/03/2024"]])
+        refreshed = load_and_extract_headers([file_path], cache_path=cache_path)
+        assert refreshed[file_path] == first[file_path]
+
+
 class TestIsFloatCheck:
     """Test is_float_check function."""
 
@@ -75,6 +161,102 @@ class TestTryParseDate:
         assert pd.isna(result)
 
 
+class TestParseDateSeries:
+    """Test parse_date_series function."""
+
+    def _make_df(self, dates, month=1, year=2023):
+        return pd.DataFrame(
+            {
+                "Ngày": dates,
+                "_source_file_month": [month] * len(dates),
+                "_source_file_year": [year] * len(dates),
+            }
+        )
+
+    def test_matches_row_wise_parser(self):
+        """Produce the same result as parse_date_robustly for every row."""
+        df = self._make_df(
+            [
+                "2023/01/15",
+                "2023-01-15",
+                "05/01/2023",
+                "01/05/2023",
+                "15/01/23",
+                "23/01/15",
+                "15-01-2023",
+                "abc",
+                pd.NA,
+            ]
+        )
+        expected = pd.to_datetime(df.apply(parse_date_robustly, axis=1))
+        result = parse_date_series(df)
+        pd.testing.assert_series_equal(
+            result, expected, check_names=False, check_dtype=False
+        )
+
+    def test_ambiguous_date_uses_source_month(self):
+        """Resolve DD/MM vs MM/DD using the source file month."""
+        result = parse_date_series(self._make_df(["05/01/2023"], month=5))
+        assert result.iloc[0] == pd.Timestamp(2023, 5, 1)
+
+    def test_duplicate_dates_keep_row_alignment(self):
+        """Repeated date strings are parsed per (date, month, year) key."""
+        df = pd.DataFrame(
+            {
+                "Ngày": ["05/01/2023", "05/01/2023", "05/01/2023"],
+                "_source_file_month": [5, 1, 5],
+                "_source_file_year": [2023, 2023, 2023],
+            },
+            index=[10, 20, 30],
+        )
+        result = parse_date_series(df)
+        assert list(result.index) == [10, 20, 30]
+        assert result[10] == pd.Timestamp(2023, 5, 1)
+        assert result[20] == pd.Timestamp(2023, 1, 5)
+        assert result[30] == pd.Timestamp(2023, 5, 1)
+
+    def test_unparseable_falls_back_to_source_month(self):
+        """Use first day of source month when nothing parses."""
+        result = parse_date_series(self._make_df(["abc"], month=3, year=2024))
+        assert result.iloc[0] == pd.Timestamp(2024, 3, 1)
+
+
+class TestCleanDates:
+    """Test clean_dates function."""
+
+    def test_excel_serial_and_string_dates(self):
+        """Convert Excel serials and date strings to ISO dates."""
+        df = pd.DataFrame(
+            {
+                "Ngày": ["45292", "15/01/2024", "abc", pd.NA],
+                "_source_file_month": [1, 1, 1, 1],
+                "_source_file_year": [2024, 2024, 2024, 2024],
+            }
+        )
+        result = clean_dates(df)
+        assert list(result["Ngày"][:3]) == [
+            pd.Timestamp(2024, 1, 1),
+            pd.Timestamp(2024, 1, 15),
+            pd.Timestamp(2024, 1, 1),
+        ]
+        assert pd.isna(result["Ngày"][3])
+
+    def test_mismatched_date_forced_into_source_month(self):
+        """Back-filled dates from another month are clamped into the source month."""
+        df = pd.DataFrame(
+            {
+                "Ngày": ["15/01/2024", "31/03/2024"],
+                "_source_file_month": [2, 3],
+                "_source_file_year": [2024, 2024],
+            }
+        )
+        result = clean_dates(df)
+        assert list(result["Ngày"]) == [
+            pd.Timestamp(2024, 2, 29),
+            pd.Timestamp(2024, 3, 31),
+        ]
+
+
 class TestCleanTextColumn:
     """Test clean_text_column function."""
 
@@ -123,8 +305,29 @@ class TestStandardizeColumnTypes:
         assert pd.isna(result["Đơn giá"][2])
 
     def test_integer_columns(self):
-        """Convert Tháng and Năm to Int64."""
+        """Convert Tháng and Năm to nullable Int16."""
         df = pd.DataFrame({"Tháng": ["1", "2", "12"], "Năm": ["2023", "2024", "2025"]})
         result = standardize_column_types(df)
+        assert result["Tháng"].dtype == "Int16"
+        assert result["Năm"].dtype == "Int16"
         assert result["Tháng"][0] == 1
         assert result["Năm"][0] == 2023
+
+
+class TestGenerateOutputFilename:
+    """Test generate_output_filename function."""
+
+    def test_uses_year_month_range(self):
+        """Name the file after the earliest and latest source months."""
+        df = pd.DataFrame(
+            {
+                "Tháng": pd.array([3, 12, None, 1], dtype="Int64"),
+                "Năm": pd.array([2023, 2024, 2025, 2023], dtype="Int64"),
+            }
+        )
+        assert generate_output_filename(df) == "Chi tiết nhập 2023-01_2024-12.csv"
+        assert list(df.columns) == ["Tháng", "Năm"]
+
+    def test_missing_columns(self):
+        """Fall back to a fixed name without year/month columns."""
+        assert generate_output_filename(pd.DataFrame()) == "Chi tiết nhập.csv"
@@ -14,6 +14,7 @@ from src.modules.import_export_receipts.generate_products_xlsx import (
     find_latest_file,
     get_latest_inventory,
     get_sort_key,
+    get_sort_keys,
     get_product_names_from_nhap,
     standardize_brand_names,
 )
@@ -54,6 +55,23 @@ class TestHelperFunctions:
         result = get_sort_key("X", nhap_df)
         assert result == (pd.NaT, "", 0)
 
+    def test_get_sort_keys_uses_first_row_per_product(self):
+        """Batch sort keys match get_sort_key and skip unknown products."""
+        nhap_df = pd.DataFrame(
+            {
+                "Mã hàng": ["B", "A", "A", "B"],
+                "Ngày": ["2025-02-01", "2025-01-15", "2025-01-20", "2025-01-01"],
+                "Mã chứng từ": ["CT003", "CT001", "CT002", "CT004"],
+                "Thành tiền": [3000, 1000, 2000, 4000],
+            }
+        )
+
+        result = get_sort_keys(["A", "B", "X"], nhap_df)
+
+        assert set(result) == {"A", "B"}
+        assert result["A"] == (pd.Timestamp("2025-01-15"), "CT001", 1000.0)
+        assert result["B"] == get_sort_key("B", nhap_df)
+
     def test_standardize_brand_names(self):
         """Test brand name standardization."""
         df = pd.DataFrame(
@@ -1,16 +1,20 @@
 # -*- coding: utf-8 -*-
 """Tests for clean_receipts_sale module."""
 
+import warnings
+
 import pandas as pd
 from pathlib import Path
 from src.modules.import_export_receipts.clean_receipts_sale import (
     extract_year_month_from_filename,
     combine_headers,
+    parse_unique_dates,
     process_dates,
     clean_text_column,
     standardize_column_types,
     fill_and_adjust_rows,
     generate_output_filename,
+    validate_data_completeness,
 )
 
 
@@ -155,6 +159,16 @@ class TestFillAndAdjustRows:
         assert result.iloc[0]["Đơn giá"] == 100  # Made positive
 
 
+class TestValidateDataCompleteness:
+    """Test sparse column reporting."""
+
+    def test_empty_frame(self):
+        """Empty frame is skipped without a divide-by-zero warning."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            validate_data_completeness(pd.DataFrame(columns=["Số lượng"]))
+
+
 class TestGenerateOutputFilename:
     """Test output filename generation."""
 
@@ -205,3 +219,17 @@ class TestProcessDates:
         df = pd.DataFrame({"Ngày": ["15/03/2024"]})
         result = process_dates(df, 2024, 3)
         assert result["Ngày"].iloc[0] == "2024-03-15"
+
+
+class TestParseUniqueDates:
+    """Test deduplicated date parsing."""
+
+    def test_matches_to_datetime(self):
+        """Repeated, invalid and missing values parse like pd.to_datetime."""
+        values = pd.Series(
+            ["15/03/2024", "bad", None, "15/03/2024", "01/03/2024"],
+            index=[4, 3, 2, 1, 0],
+        )
+        result = parse_unique_dates(values, "%d/%m/%Y")
+        expected = pd.to_datetime(values, format="%d/%m/%Y", errors="coerce")
+        pd.testing.assert_series_equal(result, expected)
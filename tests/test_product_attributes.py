@@ -0,0 +1,98 @@
+"""Tests for src/utils/product_attributes.py."""
+
+import pandas as pd
+
+from src.utils.product_attributes import (
+    extract_attributes,
+    extract_attributes_extended,
+    extract_attributes_series,
+)
+
+
+class TestExtractAttributes:
+    """Test extract_attributes function."""
+
+    def test_fractional_tubeless_tire(self):
+        """Extract W/H-D dimension and tubeless type."""
+        result = extract_attributes("CAMEL 110/70-12 CMI 547 T/L")
+        assert result == "Kích thước:110/70-12|Loại vỏ:Không ruột"
+
+    def test_tube_type_tire(self):
+        """Upper-case TT marks a tube-type tire."""
+        assert extract_attributes("VỎ 2.50-17 TT") == (
+            "Kích thước:2.50-17|Loại vỏ:Có ruột"
+        )
+
+    def test_tubeless_code_wins_over_earlier_tube_code(self):
+        """A tubeless code anywhere in the name takes precedence over TT/TR."""
+        assert extract_attributes("VỎ TT 2.50-17 tl") == (
+            "Kích thước:2.50-17|Loại vỏ:Không ruột"
+        )
+        assert extract_attributes("VỎ 2.50-17 tt") == "Kích thước:2.50-17"
+
+    def test_american_size(self):
+        """Fall through to the W-D-P dimension."""
+        assert extract_attributes("SĂM 3-10-4") == "Kích thước:3-10-4"
+
+    def test_name_without_dimension(self):
+        """Names with no dimension run every extractor and return empty."""
+        assert extract_attributes("NHỚT HONDA SỐ 0.8L") == ""
+
+    def test_invalid_input(self):
+        """Empty or non-string input returns empty string."""
+        assert extract_attributes("") == ""
+        assert extract_attributes(None) == ""
+
+
+class TestExtractAttributesSeries:
+    """Test extract_attributes_series function."""
+
+    def test_matches_scalar_function(self):
+        """Repeated and missing names map to the scalar results."""
+        names = pd.Series(
+            ["VỎ 80/90-14 TL", None, "NHỚT HONDA 1L", "VỎ 80/90-14 TL"],
+            index=[3, 5, 7, 9],
+        )
+        result = extract_attributes_series(names)
+
+        assert result.index.tolist() == [3, 5, 7, 9]
+        assert result.tolist() == [
+            extract_attributes("VỎ 80/90-14 TL"),
+            "",
+            extract_attributes("NHỚT HONDA 1L"),
+            extract_attributes("VỎ 80/90-14 TL"),
+        ]
+
+
+class TestExtractAttributesExtended:
+    """Test extract_attributes_extended function."""
+
+    def test_oil_product(self):
+        """Extract oil volume and brand with description."""
+        result = extract_attributes_extended("NHỚT HONDA SỐ 0.8L")
+        assert "Dung tích nhớt:0.8L" in result["Thuộc tính"]
+        assert "Thương hiệu nhớt:HONDA" in result["Thuộc tính"]
+        assert "Dung tích: 0.8 lít. Thương hiệu: HONDA" in result["Mô tả"]
+
+    def test_tire_with_position(self):
+        """Extract dimension, type and position for a front tire."""
+        result = extract_attributes_extended("VỎ TRƯỚC 80/90-14 TL")
+        assert "Kích thước:80/90-14" in result["Thuộc tính"]
+        assert "Loại vỏ:Không ruột" in result["Thuộc tính"]
+        assert "Vị trí:Vỏ trước" in result["Thuộc tính"]
+        assert result["Mô tả"].startswith(
+            "Kích thước lốp: rộng 80 milimét, cao 90 milimét, đường kính 14 insơ"
+        )
+
+    def test_oil_brand_follows_list_priority(self):
+        """When several brands appear, the earlier-listed brand wins."""
+        result = extract_attributes_extended("NHỚT SHELL honda 1L")
+        assert "Thương hiệu nhớt:HONDA" in result["Thuộc tính"]
+        assert "Thương hiệu" not in extract_attributes_extended("DÂY GA")["Mô tả"]
+
+    def test_repeat_calls_return_independent_dicts(self):
+        """Cached results are not shared between callers."""
+        first = extract_attributes_extended("VỎ 80/90-14 TL")
+        first["Thuộc tính"] = "changed"
+        second = extract_attributes_extended("VỎ 80/90-14 TL")
+        assert second["Thuộc tính"] == "Kích thước:80/90-14|Loại vỏ:Không ruột"